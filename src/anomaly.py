@@ -1,34 +1,94 @@
 # anomaly.py
+import hashlib
+import threading
+from collections import OrderedDict
+
+import joblib
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import IsolationForest
 
 NUM_FEATURES = ["amount_bank", "amount_ledger", "amount_diff", "days_diff", "dup_ref"]
 
-def detect_anomalies(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
+ISO_PARAMS = {
+    "n_estimators": 100,
+    "max_samples": 256,
+    "contamination": 0.15,  # ~15% anomalies
+    "random_state": 42,
+    "n_jobs": -1,
+}
+
+# Each tree already subsamples max_samples rows, so larger inputs are fitted on a
+# fixed-size random subset (scoring still covers every row)
+FIT_SUBSAMPLE = 10_000
+
+# Fitted forests are kept in-process (least recently used evicted first), keyed on the
+# training sample + ISO_PARAMS, so reruns on the same data skip the refit
+MODEL_CACHE_SIZE = 4
+_MODEL_CACHE: "OrderedDict[str, IsolationForest]" = OrderedDict()
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _training_sample(Xmat: np.ndarray) -> np.ndarray:
+    if len(Xmat) <= FIT_SUBSAMPLE:
+        return Xmat
+    sub_idx = np.random.default_rng(ISO_PARAMS["random_state"]).choice(
+        len(Xmat), size=FIT_SUBSAMPLE, replace=False
+    )
+    return Xmat[sub_idx]
+
 
-    # Prepare feature matrix robustly
-    X = out.copy()
-    for col in NUM_FEATURES:
-        if col not in X.columns:
-            X[col] = 0
-        X[col] = pd.to_numeric(X[col], errors="coerce").fillna(0)
+def _model_key(Xfit: np.ndarray) -> str:
+    # Xfit has at most FIT_SUBSAMPLE rows, so hashing it is bounded regardless of input size
+    h = hashlib.sha1(np.ascontiguousarray(Xfit).tobytes())
+    params = (Xfit.shape, Xfit.dtype.str, NUM_FEATURES, sorted(ISO_PARAMS.items()))
+    h.update(repr(params).encode())
+    return h.hexdigest()
 
-    if len(X) == 0:
+
+def _fitted_forest(Xmat: np.ndarray) -> IsolationForest:
+    """Return the forest trained on this feature matrix's training sample, fitting it on a cache miss."""
+    Xfit = _training_sample(Xmat)
+    key = _model_key(Xfit)
+    with _MODEL_CACHE_LOCK:
+        iso = _MODEL_CACHE.get(key)
+        if iso is not None:
+            _MODEL_CACHE.move_to_end(key)
+            return iso
+
+    # never ask for more samples per tree than there are rows (sklearn warns and clips)
+    params = {**ISO_PARAMS, "max_samples": min(ISO_PARAMS["max_samples"], len(Xfit))}
+    iso = IsolationForest(**params).fit(Xfit)
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE[key] = iso
+        while len(_MODEL_CACHE) > MODEL_CACHE_SIZE:
+            _MODEL_CACHE.popitem(last=False)
+    return iso
+
+
+def detect_anomalies(df: pd.DataFrame) -> pd.DataFrame:
+    # Shallow copy: only new/replaced columns are allocated, existing data is shared
+    out = df.copy(deep=False)
+
+    if len(out) == 0:
         out["iso_score"] = 0.0
         out["iso_is_anomaly"] = False
         return out
 
+    # One contiguous float32 matrix shared by fit/score/predict, built straight from the
+    # feature columns (missing features stay 0) without copying the frame
+    Xmat = np.zeros((len(out), len(NUM_FEATURES)), dtype=np.float32)
+    for j, col in enumerate(NUM_FEATURES):
+        if col in out.columns:
+            Xmat[:, j] = pd.to_numeric(out[col], errors="coerce").fillna(0).to_numpy(dtype=np.float32)
+
     # Train IsolationForest
     try:
-        iso = IsolationForest(
-            n_estimators=200,
-            contamination=0.15,  # ~15% anomalies
-            random_state=42,
-        )
-        iso.fit(X[NUM_FEATURES])
-        scores = -iso.score_samples(X[NUM_FEATURES])  # higher = more anomalous
-        preds = iso.predict(X[NUM_FEATURES])  # -1 anomalous, 1 normal
+        iso = _fitted_forest(Xmat)
+        # n_jobs only parallelizes fit; scoring needs an explicit backend
+        with joblib.parallel_backend("threading", n_jobs=-1):
+            scores = -iso.score_samples(Xmat)  # higher = more anomalous
+            preds = iso.predict(Xmat)  # -1 anomalous, 1 normal
 
         out["iso_score"] = pd.Series(scores, index=out.index)
         out["iso_is_anomaly"] = (preds == -1)
@@ -38,12 +98,11 @@ def detect_anomalies(df: pd.DataFrame) -> pd.DataFrame:
         out["iso_is_anomaly"] = False
 
     # Anomaly reason: keep root cause for missing; otherwise multivariate
-    out["anomaly_reason"] = out.get("anomaly_reason", "Multivariate Outlier")
-    mask_missing_bank = out["root_cause"] == "Missing in Bank"
-    mask_missing_ledger = out["root_cause"] == "Missing in Ledger"
-    out.loc[mask_missing_bank, "anomaly_reason"] = "Missing in Bank"
-    out.loc[mask_missing_ledger, "anomaly_reason"] = "Missing in Ledger"
-    out.loc[~(mask_missing_bank | mask_missing_ledger), "anomaly_reason"] = \
-        out.loc[~(mask_missing_bank | mask_missing_ledger), "anomaly_reason"].fillna("Multivariate Outlier")
+    # (whole-column replacement, so the shallow copy never writes into df's data)
+    reason = out["anomaly_reason"] if "anomaly_reason" in out.columns else pd.Series(
+        "Multivariate Outlier", index=out.index
+    )
+    missing = out["root_cause"].isin(["Missing in Bank", "Missing in Ledger"])
+    out["anomaly_reason"] = reason.fillna("Multivariate Outlier").mask(missing, out["root_cause"])
 
     return out
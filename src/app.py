@@ -3,11 +3,17 @@ from __future__ import annotations
 
 import os
 import io
+import hashlib
 import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 
+try:  # optional: JIT root-cause kernel for very large reconciliations
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Uses your existing PDF builder (already saved by you)
 from report_pdf import generate_executive_report
 
@@ -26,6 +32,10 @@ st.set_page_config(
 # -----------------------------
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 
+# Bound for caches keyed on uploads / per-frame output: this is a long-lived server, so
+# each cache keeps only the most recent few results instead of one per upload forever
+CACHE_MAX_ENTRIES = 8
+
 
 def _to_datetime_safe(s, fmt=None):
     try:
@@ -34,27 +44,89 @@ def _to_datetime_safe(s, fmt=None):
         return pd.to_datetime(s, errors="coerce")
 
 
-def _read_csv_safe(path_or_buffer) -> pd.DataFrame:
+# Known layouts of the bundled ./data/ CSVs, parsed straight into their working dtypes.
+# Amounts are read as float64; _reconcile downcasts them once its rules have run.
+BANK_SCHEMA = {
+    "dtype": {"ref": "string", "amount_bank": "float64", "account_bank": "category", "narration": "string"},
+    "parse_dates": ["date_bank"],
+}
+LEDGER_SCHEMA = {
+    "dtype": {
+        "ref": "string",
+        "amount_ledger": "float64",
+        "account_ledger": "category",
+        "category": "string",
+        "remark": "string",
+    },
+    "parse_dates": ["date_ledger"],
+}
+
+
+def _read_csv_safe(path_or_buffer, dtype=None, parse_dates=None) -> pd.DataFrame:
+    # not cached itself: every caller (default loaders, reconcile_from_bytes) caches its result
     try:
-        df = pd.read_csv(path_or_buffer)
-        return df
-    except Exception:
-        # some CSVs may be semicolon separated
+        if isinstance(path_or_buffer, (str, os.PathLike)):
+            with open(path_or_buffer, "rb") as fh:
+                raw = fh.read()
+        else:
+            raw = path_or_buffer.read()
+        # some CSVs may be semicolon separated: sniff once instead of re-parsing on failure
+        head = raw[:4096].decode("utf-8", "ignore")
+        sep = ";" if head.count(";") > head.count(",") else ","
         try:
-            return pd.read_csv(path_or_buffer, sep=";")
-        except Exception:
-            return pd.DataFrame()
+            return pd.read_csv(
+                io.BytesIO(raw), sep=sep, engine="pyarrow", dtype=dtype, parse_dates=parse_dates
+            )
+        except ValueError:
+            # pyarrow rejects some inputs the C parser copes with (ArrowInvalid is a ValueError)
+            return pd.read_csv(
+                io.BytesIO(raw), sep=sep, engine="c", dtype=dtype, parse_dates=parse_dates
+            )
+    except Exception:
+        return pd.DataFrame()
+
+
+def _frame_key(df: pd.DataFrame) -> str:
+    """
+    Exact content digest of a frame, for caches whose argument is a DataFrame:
+    st.cache_data only hashes a row sample of large frames, so edits could be missed.
+    """
+    h = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    h.update(repr(list(df.columns)).encode())
+    return h.hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _cached_csv_bytes(_df: pd.DataFrame, key: str) -> bytes:
+    return _df.to_csv(index=False).encode("utf-8")
+
+
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """CSV bytes for st.download_button; cached so reruns don't re-serialize an unchanged frame."""
+    return _cached_csv_bytes(df, _frame_key(df))
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _cached_report_pdf(_df: pd.DataFrame, key: str) -> bytes:
+    return generate_executive_report(_df)
+
 
+def _report_pdf(df: pd.DataFrame) -> bytes:
+    """Executive PDF bytes; regenerating for an unchanged frame returns the cached document."""
+    return _cached_report_pdf(df, _frame_key(df))
 
+
+@st.cache_data(show_spinner=False)
 def load_default_bank_ledger() -> tuple[pd.DataFrame, pd.DataFrame]:
     """Load default bank & ledger CSVs from ./data/"""
     bank_path = os.path.normpath(os.path.join(DATA_DIR, "bank_statement.csv"))
     ledger_path = os.path.normpath(os.path.join(DATA_DIR, "ledger_entries.csv"))
-    bank = _read_csv_safe(bank_path)
-    ledger = _read_csv_safe(ledger_path)
+    bank = _read_csv_safe(bank_path, **BANK_SCHEMA)
+    ledger = _read_csv_safe(ledger_path, **LEDGER_SCHEMA)
     return bank, ledger
 
 
+@st.cache_data(show_spinner=False)
 def load_default_transactions() -> pd.DataFrame:
     """Optional lookup for NLP Categories."""
     tx_path = os.path.normpath(os.path.join(DATA_DIR, "transactions.csv"))
@@ -63,12 +135,34 @@ def load_default_transactions() -> pd.DataFrame:
     return pd.DataFrame(columns=["ref", "remark", "category"])
 
 
+def _lookup_series(keys: pd.Series, values: pd.Series) -> pd.Series:
+    """Index `values` by `keys` as str; on duplicate keys the last row wins (same as dict(zip(...)))."""
+    lookup = pd.Series(values.to_numpy(), index=keys.astype(str))
+    return lookup[~lookup.index.duplicated(keep="last")]
+
+
+@st.cache_data(show_spinner=False)
+def _category_lookups() -> tuple[pd.Series, pd.Series] | None:
+    """ref→category and remark→category lookups from transactions.csv, built once and cached."""
+    tx = load_default_transactions()
+    if tx.empty or "remark" not in tx.columns or "category" not in tx.columns:
+        return None
+    return _lookup_series(tx["ref"], tx["category"]), _lookup_series(tx["remark"], tx["category"])
+
+
+def _account_categorical(s: pd.Series) -> pd.Categorical:
+    """Accounts as a categorical of stripped strings; the str work runs once per distinct value."""
+    codes, uniques = pd.factorize(s)
+    label_codes, labels = pd.factorize(pd.Index(uniques).astype(str).str.strip())
+    # trailing -1 keeps missing accounts (code -1) missing
+    return pd.Categorical.from_codes(np.append(label_codes, -1)[codes], categories=labels)
+
+
 def _normalize_bank(bank: pd.DataFrame) -> pd.DataFrame:
     """Rename/ensure bank columns exist as: date_bank, ref, amount_bank, account_bank, narration"""
     if bank is None or bank.empty:
         return pd.DataFrame(columns=["date_bank", "ref", "amount_bank", "account_bank", "narration"])
 
-    b = bank.copy()
     cols = {c.lower().strip(): c for c in bank.columns}
     # Flexible mappings
     mapping = {}
@@ -79,15 +173,19 @@ def _normalize_bank(bank: pd.DataFrame) -> pd.DataFrame:
     mapping[cols.get("narration", cols.get("description", cols.get("remark", None)))] = "narration"
     mapping = {k: v for k, v in mapping.items() if k is not None}
 
-    b = b.rename(columns=mapping)
+    # rename() already returns a new frame; no up-front copy needed
+    b = bank.rename(columns=mapping)
     # Ensure required columns exist
     for col in ["date_bank", "ref", "amount_bank", "account_bank", "narration"]:
         if col not in b.columns:
             b[col] = np.nan
 
-    b["date_bank"] = _to_datetime_safe(b["date_bank"])
-    # coerce numeric
+    if not pd.api.types.is_datetime64_any_dtype(b["date_bank"]):
+        b["date_bank"] = _to_datetime_safe(b["date_bank"])
+    # coerce numeric; stays float64 until the tolerance rules in _reconcile have run
     b["amount_bank"] = pd.to_numeric(b["amount_bank"], errors="coerce")
+    # few distinct accounts: store as categorical codes
+    b["account_bank"] = _account_categorical(b["account_bank"])
     return b[["date_bank", "ref", "amount_bank", "account_bank", "narration"]]
 
 
@@ -98,7 +196,6 @@ def _normalize_ledger(ledger: pd.DataFrame) -> pd.DataFrame:
             columns=["date_ledger", "ref", "amount_ledger", "account_ledger", "category", "remark"]
         )
 
-    l = ledger.copy()
     cols = {c.lower().strip(): c for c in ledger.columns}
     mapping = {}
     mapping[cols.get("date_ledger", cols.get("date", None))] = "date_ledger"
@@ -109,22 +206,87 @@ def _normalize_ledger(ledger: pd.DataFrame) -> pd.DataFrame:
     mapping[cols.get("remark", cols.get("narration", cols.get("description", None)))] = "remark"
     mapping = {k: v for k, v in mapping.items() if k is not None}
 
-    l = l.rename(columns=mapping)
+    # rename() already returns a new frame; no up-front copy needed
+    l = ledger.rename(columns=mapping)
     for col in ["date_ledger", "ref", "amount_ledger", "account_ledger", "category", "remark"]:
         if col not in l.columns:
             l[col] = np.nan
 
-    l["date_ledger"] = _to_datetime_safe(l["date_ledger"])
+    if not pd.api.types.is_datetime64_any_dtype(l["date_ledger"]):
+        l["date_ledger"] = _to_datetime_safe(l["date_ledger"])
     l["amount_ledger"] = pd.to_numeric(l["amount_ledger"], errors="coerce")
+    l["account_ledger"] = _account_categorical(l["account_ledger"])
     return l[["date_ledger", "ref", "amount_ledger", "account_ledger", "category", "remark"]]
 
 
-def reconcile(bank: pd.DataFrame, ledger: pd.DataFrame) -> pd.DataFrame:
+ROOT_CAUSE_LABELS = np.array(
+    ["Matched", "Missing in Bank", "Missing in Ledger", "Amount Mismatch", "Date Mismatch", "Uncategorized"]
+)
+# Below this many merged rows np.select is already fast and JIT warm-up is not worth it
+NUMBA_MIN_ROWS = 1_000_000
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _root_cause_kernel(amt_bank, amt_ledger, amt_diff, days_diff, match, tol):
+        """Single pass over the raw arrays; returns int8 indexes into ROOT_CAUSE_LABELS."""
+        out = np.empty(match.shape[0], dtype=np.int8)
+        for i in prange(match.shape[0]):
+            has_bank = not np.isnan(amt_bank[i])
+            has_ledger = not np.isnan(amt_ledger[i])
+            if match[i]:
+                out[i] = 0
+            elif has_ledger and not has_bank:
+                out[i] = 1
+            elif has_bank and not has_ledger:
+                out[i] = 2
+            elif has_bank and has_ledger and abs(amt_diff[i]) > tol:
+                out[i] = 3
+            elif has_bank and has_ledger and abs(days_diff[i]) > 3:  # NaN compares False
+                out[i] = 4
+            else:
+                out[i] = 5
+        return out
+
+else:
+    _root_cause_kernel = None
+
+
+def _percentile(arr: np.ndarray, q: float) -> float:
+    """np.nanpercentile (linear interpolation) via an O(n) partial sort; 1.0 if there is no data."""
+    arr = arr[~np.isnan(arr)]
+    if arr.size == 0:
+        return 1.0
+    pos = (arr.size - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, arr.size - 1)
+    part = np.partition(arr, [lo, hi])
+    return float(part[lo] + (part[hi] - part[lo]) * (pos - lo))
+
+
+def _reconcile(bank: pd.DataFrame, ledger: pd.DataFrame) -> pd.DataFrame:
     """Outer-merge on ref and derive match/root_cause/iso_score flags (robust & simple)."""
     b = _normalize_bank(bank)
     l = _normalize_ledger(ledger)
 
-    merged = pd.merge(b, l, on="ref", how="outer", suffixes=("_bank", "_ledger"))
+    # One set of account categories for both sides so acct_match compares codes.
+    # set_categories recodes; astype() is a no-op for an "equal" dtype in another order.
+    acct_cats = b["account_bank"].astype("category").cat.categories.union(
+        l["account_ledger"].astype("category").cat.categories
+    )
+    b["account_bank"] = b["account_bank"].astype("category").cat.set_categories(acct_cats)
+    l["account_ledger"] = l["account_ledger"].astype("category").cat.set_categories(acct_cats)
+
+    # Shared categorical ref: the join hashes integer codes instead of strings.
+    # Sorted categories keep the outer join's row order (it sorts by key).
+    refs = pd.concat([b["ref"], l["ref"]], ignore_index=True).dropna().unique()
+    ref_dtype = pd.CategoricalDtype(np.sort(refs))
+    b["ref"] = b["ref"].astype(ref_dtype)
+    l["ref"] = l["ref"].astype(ref_dtype)
+
+    merged = pd.merge(
+        b, l, on="ref", how="outer", suffixes=("_bank", "_ledger"), validate="many_to_many"
+    )
 
     # Differences & flags
     merged["amount_diff"] = (merged["amount_ledger"] - merged["amount_bank"]).fillna(0)
@@ -138,50 +300,58 @@ def reconcile(bank: pd.DataFrame, ledger: pd.DataFrame) -> pd.DataFrame:
     tol = 1.0
     both_present = merged["amount_bank"].notna() & merged["amount_ledger"].notna()
     amt_close = both_present & (merged["amount_diff"].abs() <= tol)
+    # code -1 on both sides (account missing on both) counts as a match
     acct_match = (
-        merged["account_bank"].fillna("").astype(str).str.strip()
-        == merged["account_ledger"].fillna("").astype(str).str.strip()
+        merged["account_bank"].cat.codes.to_numpy() == merged["account_ledger"].cat.codes.to_numpy()
     )
     merged["match"] = (amt_close & acct_match).astype(bool)
 
-    # Root cause
-    def _rc(row):
-        if row["match"]:
-            return "Matched"
-        if pd.isna(row["amount_bank"]) and pd.notna(row["amount_ledger"]):
-            return "Missing in Bank"
-        if pd.notna(row["amount_bank"]) and pd.isna(row["amount_ledger"]):
-            return "Missing in Ledger"
-        if pd.notna(row["amount_bank"]) and pd.notna(row["amount_ledger"]):
-            if abs(row["amount_diff"]) > tol:
-                return "Amount Mismatch"
-            # amount ok but date spread
-            if pd.notna(row.get("days_diff", np.nan)) and abs(row.get("days_diff", 0)) > 3:
-                return "Date Mismatch"
-        return "Matched" if row["match"] else "Uncategorized"
-
-    merged["root_cause"] = merged.apply(_rc, axis=1)
-
-    # Simple anomaly score (0..1): normalize abs amount diff + date difference
-    amt_norm = (merged["amount_diff"].abs() / (merged["amount_ledger"].abs() + 1e-9)).clip(0, 1)
-    day_norm = (merged["days_diff"].fillna(0).abs() / 30.0).clip(0, 1)
-    merged["iso_score"] = (0.7 * amt_norm + 0.3 * day_norm).fillna(0)
+    # Root cause (vectorized; first matching condition wins)
+    amt_off = merged["amount_diff"].abs() > tol
+    days_off = merged["days_diff"].abs() > 3
+    if _root_cause_kernel is not None and len(merged) >= NUMBA_MIN_ROWS:
+        codes = _root_cause_kernel(
+            merged["amount_bank"].to_numpy(dtype=float),
+            merged["amount_ledger"].to_numpy(dtype=float),
+            merged["amount_diff"].to_numpy(dtype=float),
+            merged["days_diff"].to_numpy(dtype=float),
+            merged["match"].to_numpy(),
+            tol,
+        )
+        merged["root_cause"] = ROOT_CAUSE_LABELS[codes]
+    else:
+        merged["root_cause"] = np.select(
+            [
+                merged["match"],
+                merged["amount_bank"].isna() & merged["amount_ledger"].notna(),
+                merged["amount_bank"].notna() & merged["amount_ledger"].isna(),
+                both_present & amt_off,
+                both_present & days_off,
+            ],
+            ROOT_CAUSE_LABELS[:-1],
+            default=ROOT_CAUSE_LABELS[-1],
+        )
+
+    # Simple anomaly score (0..1): normalize abs amount diff + date difference.
+    # Computed on the raw arrays, so no intermediate Series are allocated.
+    ad = merged["amount_diff"].to_numpy(dtype=float)
+    al = merged["amount_ledger"].to_numpy(dtype=float)
+    dd = merged["days_diff"].to_numpy(dtype=float)
+    amt_norm = np.clip(np.abs(ad) / (np.abs(al) + 1e-9), 0, 1)
+    day_norm = np.clip(np.abs(np.nan_to_num(dd)) / 30.0, 0, 1)
+    merged["iso_score"] = np.nan_to_num(0.7 * amt_norm + 0.3 * day_norm)
 
     # Flag top 15% as anomaly
-    threshold = np.nanpercentile(merged["iso_score"], 85) if len(merged) else 1.0
+    threshold = _percentile(merged["iso_score"].to_numpy(), 85)
     merged["iso_is_anomaly"] = merged["iso_score"] >= threshold
 
     # Lightweight anomaly_reason
-    def _ar(row):
-        if row["root_cause"] in ["Missing in Bank", "Missing in Ledger"]:
-            return row["root_cause"]
-        if abs(row["amount_diff"]) > tol:
-            return "Unusual Amount Difference"
-        if pd.notna(row.get("days_diff", np.nan)) and abs(row.get("days_diff", 0)) > 3:
-            return "Unusual Date Gap"
-        return "Multivariate Outlier" if row["iso_is_anomaly"] else "OK"
-
-    merged["anomaly_reason"] = merged.apply(_ar, axis=1)
+    missing = merged["root_cause"].isin(["Missing in Bank", "Missing in Ledger"])
+    merged["anomaly_reason"] = np.select(
+        [missing, amt_off, days_off, merged["iso_is_anomaly"]],
+        [merged["root_cause"], "Unusual Amount Difference", "Unusual Date Gap", "Multivariate Outlier"],
+        default="OK",
+    )
 
     # Ensure helpful defaults
     for c in ["category", "remark"]:
@@ -189,23 +359,39 @@ def reconcile(bank: pd.DataFrame, ledger: pd.DataFrame) -> pd.DataFrame:
             merged[c] = np.nan
 
     # NLP predicted_category (optional). If transactions.csv exists, map remark→category
-    tx = load_default_transactions()
-    if not tx.empty and "remark" in tx.columns and "category" in tx.columns:
+    lookups = _category_lookups()
+    if lookups is not None:
         # simple keyword join: left on ref OR exact remark match
-        map_by_ref = dict(zip(tx["ref"].astype(str), tx["category"]))
-        merged["predicted_category"] = merged["ref"].astype(str).map(map_by_ref)
+        by_ref, by_remark = lookups
+        merged["predicted_category"] = merged["ref"].astype(str).map(by_ref)
         # fill by remark exact match if still missing
-        if "remark" in merged.columns and "remark" in tx.columns:
-            map_by_remark = dict(zip(tx["remark"].astype(str), tx["category"]))
-            merged["predicted_category"] = merged["predicted_category"].fillna(
-                merged["remark"].astype(str).map(map_by_remark)
-            )
+        merged["predicted_category"] = merged["predicted_category"].fillna(
+            merged["remark"].astype(str).map(by_remark)
+        )
     else:
         merged["predicted_category"] = np.nan
 
+    # Downcast only after every rule/score above compared the amounts at full precision
+    for c in ("amount_bank", "amount_ledger", "amount_diff"):
+        merged[c] = merged[c].astype(np.float32)
+
     return merged
 
 
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def reconcile(bank: pd.DataFrame, ledger: pd.DataFrame) -> pd.DataFrame:
+    """Cached reconciliation; reruns with identical frames skip the merge/scoring."""
+    return _reconcile(bank, ledger)
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def reconcile_from_bytes(bank_bytes: bytes, ledger_bytes: bytes) -> pd.DataFrame:
+    """Cached reconciliation keyed on raw upload bytes (cheaper to hash than DataFrames)."""
+    bank = _read_csv_safe(io.BytesIO(bank_bytes))
+    ledger = _read_csv_safe(io.BytesIO(ledger_bytes))
+    return _reconcile(bank, ledger)
+
+
 def kpis(df: pd.DataFrame) -> tuple[int, int, int, int]:
     total = len(df)
     matched = int(df.get("match", pd.Series([False] * total)).astype(bool).sum())
@@ -214,6 +400,47 @@ def kpis(df: pd.DataFrame) -> tuple[int, int, int, int]:
     return total, matched, mismatched, anomalies
 
 
+# -----------------------------
+# Charts (cached on their plotted values, so reruns skip Plotly figure construction)
+# -----------------------------
+def _counts(s: pd.Series, dropna: bool = True) -> tuple:
+    """value_counts() as a hashable ((label, count), ...) tuple for the chart caches."""
+    return tuple(s.value_counts(dropna=dropna).items())
+
+
+def _chart_layout(fig):
+    fig.update_layout(height=360, margin=dict(l=10, r=10, t=60, b=10))
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _bar_fig(counts: tuple, label: str, title: str):
+    data = pd.DataFrame(list(counts), columns=[label, "count"])
+    return _chart_layout(px.bar(data, x=label, y="count", title=title))
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _pie_fig(counts: tuple, title: str):
+    names, values = zip(*counts) if counts else ((), ())
+    return _chart_layout(px.pie(names=list(names), values=list(values), title=title, hole=0.4))
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def _hist_fig(values: np.ndarray, label: str, title: str):
+    return _chart_layout(px.histogram(pd.DataFrame({label: values}), x=label, nbins=30, title=title))
+
+
+PAGE_SIZE = 500
+
+
+def _paged_dataframe(frame: pd.DataFrame, key: str) -> None:
+    """Render one PAGE_SIZE slice so reruns only ship that many rows to the browser."""
+    n_pages = max(1, -(-len(frame) // PAGE_SIZE))
+    page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1, key=key)
+    start = (int(page) - 1) * PAGE_SIZE
+    st.dataframe(frame.iloc[start:start + PAGE_SIZE], use_container_width=True, height=420)
+
+
 # -----------------------------
 # Sidebar – Upload & Reconcile
 # -----------------------------
@@ -251,9 +478,7 @@ if reconcile_btn:
     if bank_file is None or ledger_file is None:
         st.warning("Please upload both Bank and Ledger CSVs, then click Reconcile.")
     else:
-        bdf = _read_csv_safe(bank_file)
-        ldf = _read_csv_safe(ledger_file)
-        st.session_state.reco_df = reconcile(bdf, ldf)
+        st.session_state.reco_df = reconcile_from_bytes(bank_file.getvalue(), ledger_file.getvalue())
         st.success("Reconciliation complete for uploaded files.")
 
 df = st.session_state.reco_df
@@ -289,27 +514,20 @@ with tab1:
     st.subheader("Reconciliation Overview")
 
     # Root Cause bar
-    rc_counts = df["root_cause"].value_counts(dropna=False).rename_axis("root_cause").reset_index(name="count")
-    fig_rc = px.bar(rc_counts, x="root_cause", y="count", title="Root Cause Breakdown")
-    fig_rc.update_layout(height=360, margin=dict(l=10, r=10, t=60, b=10))
+    rc_counts = _counts(df["root_cause"], dropna=False)
+    fig_rc = _bar_fig(rc_counts, "root_cause", "Root Cause Breakdown")
     st.plotly_chart(fig_rc, use_container_width=True)
 
     # Match pie
-    match_counts = df["match"].fillna(False).map({True: "Matched", False: "Not Matched"}).value_counts()
-    fig_match = px.pie(
-        names=match_counts.index,
-        values=match_counts.values,
-        title="Match Status",
-        hole=0.4,
-    )
-    fig_match.update_layout(height=360, margin=dict(l=10, r=10, t=60, b=10))
+    match_counts = _counts(df["match"].fillna(False).map({True: "Matched", False: "Not Matched"}))
+    fig_match = _pie_fig(match_counts, "Match Status")
     st.plotly_chart(fig_match, use_container_width=True)
 
     st.markdown("### Drill-down Table")
-    st.dataframe(df, use_container_width=True, height=420)
+    _paged_dataframe(df, key="recon_page")
     st.download_button(
         "⬇️ Download Reconciliation View (CSV)",
-        data=df.to_csv(index=False).encode("utf-8"),
+        data=_csv_bytes(df),
         file_name="reconciliation_view.csv",
         mime="text/csv",
     )
@@ -322,15 +540,13 @@ with tab2:
     topk = df.sort_values("iso_score", ascending=False).head(100) if "iso_score" in df else df.head(100)
 
     # Reason bar
-    ar_counts = df["anomaly_reason"].value_counts(dropna=False).rename_axis("anomaly_reason").reset_index(name="count")
-    fig_ar = px.bar(ar_counts, x="anomaly_reason", y="count", title="Anomaly Reasons")
-    fig_ar.update_layout(height=360, margin=dict(l=10, r=10, t=60, b=10))
+    ar_counts = _counts(df["anomaly_reason"], dropna=False)
+    fig_ar = _bar_fig(ar_counts, "anomaly_reason", "Anomaly Reasons")
     st.plotly_chart(fig_ar, use_container_width=True)
 
     # Score histogram
     if "iso_score" in df:
-        fig_hist = px.histogram(df, x="iso_score", nbins=30, title="Anomaly Score Distribution")
-        fig_hist.update_layout(height=360, margin=dict(l=10, r=10, t=60, b=10))
+        fig_hist = _hist_fig(df["iso_score"].to_numpy(), "iso_score", "Anomaly Score Distribution")
         st.plotly_chart(fig_hist, use_container_width=True)
 
     st.markdown("### Top Suspicious Records")
@@ -361,10 +577,8 @@ with tab3:
 
     # Category bar (predicted if present else actual)
     cat_col = "predicted_category" if "predicted_category" in df.columns else "category"
-    cat_counts = df[cat_col].fillna("Uncategorized").value_counts().reset_index()
-    cat_counts.columns = ["category", "count"]
-    fig_cat = px.bar(cat_counts, x="category", y="count", title="Predicted Categories")
-    fig_cat.update_layout(height=360, margin=dict(l=10, r=10, t=60, b=10))
+    cat_counts = _counts(df[cat_col].fillna("Uncategorized"))
+    fig_cat = _bar_fig(cat_counts, "category", "Predicted Categories")
     st.plotly_chart(fig_cat, use_container_width=True)
 
     # Drill table
@@ -372,12 +586,12 @@ with tab3:
     if "predicted_category" in df.columns:
         show_cols.append("predicted_category")
     show_cols = [c for c in show_cols if c in df.columns]
-    st.dataframe(df[show_cols].head(1000), use_container_width=True, height=420)
+    _paged_dataframe(df[show_cols], key="nlp_page")
 
     # Download categorized data
     st.download_button(
         "⬇️ Download NLP Categorized Data",
-        data=df[show_cols].to_csv(index=False).encode("utf-8"),
+        data=_csv_bytes(df[show_cols]),
         file_name="nlp_categorized_data.csv",
         mime="text/csv",
     )
@@ -391,7 +605,7 @@ with tab4:
     if st.button("Generate & Download PDF Report"):
         with st.spinner("Generating PDF..."):
             # Your report_pdf.py can accept just the dataframe; it will handle missing charts safely.
-            pdf_bytes = generate_executive_report(df)  # if your function accepts figs, you can pass fig_rc/fig_cat too
+            pdf_bytes = _report_pdf(df)  # if your function accepts figs, you can pass fig_rc/fig_cat too
         st.success("✅ Report generated!")
         st.download_button(
             "📄 Download PDF",
@@ -1,30 +1,41 @@
 # src/generate_large_dataset.py
-import os, random
-from datetime import datetime, timedelta
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
-random.seed(42)
 np.random.seed(42)
 
 # ---------- Where to save ----------
 OUT_DIR = "../data"
 os.makedirs(OUT_DIR, exist_ok=True)
 
+COMPRESS = False  # True: write zstd-compressed .csv.zst files instead of plain .csv
+
 N = 1500  # rows for bank + ledger
 START = datetime(2025, 1, 1)
 END = datetime(2025, 6, 30)
 
 # ---------- Helpers ----------
-def random_date(start: datetime, end: datetime) -> datetime:
-    delta = (end - start).days
-    return start + timedelta(days=random.randint(0, delta))
-
-def choose_weighted(items, probs):
-    return np.random.choice(items, p=probs)
-
-def clamp_amount(x, lo, hi):
-    return int(max(lo, min(hi, x)))
+def random_dates(size: int) -> np.ndarray:
+    """`size` uniform day-resolution dates in [START, END]."""
+    offsets = np.random.randint(0, (END - START).days + 1, size=size)
+    return np.datetime64(START.date(), "D") + offsets.astype("timedelta64[D]")
+
+def random_refs(prefix: str, start: int, size: int) -> np.ndarray:
+    return np.char.add(prefix, np.arange(start, start + size).astype(str))
+
+def write_csv(df: pd.DataFrame, path: str) -> str:
+    """Write one output file (zstd-compressed when COMPRESS); returns the path written."""
+    if COMPRESS:
+        path += ".zst"
+        with pa.CompressedOutputStream(path, "zstd") as sink:
+            sink.write(df.to_csv(index=False).encode("utf-8"))
+    else:
+        df.to_csv(path, index=False)
+    return path
 
 # Transaction “types” to drive realistic amounts & narration
 TX_TYPES = [
@@ -51,32 +62,41 @@ TX_PROBS = TX_PROBS / TX_PROBS.sum()  # normalize
 
 ACCOUNTS = [202001234567, 202001234568, 202001234569]
 
+# Per-type amount bounds, indexed by the sampled type code
+AMT_LO = np.array([t[1][0] for t in TX_TYPES])
+AMT_HI = np.array([t[1][1] for t in TX_TYPES])
+
 # ---------- Generate Bank Statement (N rows) ----------
-bank_rows = []
-for i in range(N):
-    ref = f"TXN{200000 + i}"
-    tname = choose_weighted(TX_NAMES, TX_PROBS)
-    ttype = next(t for t in TX_TYPES if t[0] == tname)
-    lo, hi = ttype[1]
-    amt = random.randint(lo, hi)
-    # Add slight cyclic patterns (salary once a month more likely)
-    date = random_date(START, END)
-    if tname == "Salary" and date.day < 4:  # early month bias
-        date = date.replace(day=random.randint(1, 5))
-        amt = clamp_amount(int(np.random.normal(65000, 8000)), lo, hi)
-
-    # Narration string
-    narr = f"{ttype[2]} - {random.choice(ttype[3])}"
-
-    bank_rows.append({
-        "date_bank": date.date().isoformat(),
-        "ref": ref,
-        "amount_bank": amt,
-        "account_bank": random.choice(ACCOUNTS),
-        "narration": narr
-    })
-
-bank_df = pd.DataFrame(bank_rows)
+type_idx = np.random.choice(len(TX_TYPES), size=N, p=TX_PROBS)
+amounts = np.random.randint(AMT_LO[type_idx], AMT_HI[type_idx] + 1)
+dates = random_dates(N)
+
+# Add slight cyclic patterns (salary once a month more likely)
+day_of_month = (dates - dates.astype("datetime64[M]")).astype(int) + 1
+salary = (type_idx == TX_NAMES.index("Salary")) & (day_of_month < 4)  # early month bias
+n_salary = int(salary.sum())
+dates[salary] = (
+    dates[salary].astype("datetime64[M]")
+    + np.random.randint(0, 5, size=n_salary).astype("timedelta64[D]")
+)
+salary_lo, salary_hi = TX_TYPES[TX_NAMES.index("Salary")][1]
+amounts[salary] = np.clip(np.random.normal(65000, 8000, size=n_salary).astype(int), salary_lo, salary_hi)
+
+# Narration string: one pass per transaction type, not per row
+narrations = np.empty(N, dtype=object)
+picks = np.random.random(N)
+for k, (_, _, label, sources) in enumerate(TX_TYPES):
+    rows = type_idx == k
+    options = np.array([f"{label} - {src}" for src in sources], dtype=object)
+    narrations[rows] = options[(picks[rows] * len(options)).astype(int)]
+
+bank_df = pd.DataFrame({
+    "date_bank": dates.astype(str),
+    "ref": random_refs("TXN", 200000, N),
+    "amount_bank": amounts,
+    "account_bank": np.random.choice(ACCOUNTS, size=N),
+    "narration": narrations,
+})
 
 # ---------- Generate Ledger from Bank with anomalies ----------
 # Probabilities (summing to <= 1.0, rest are perfect matches)
@@ -87,82 +107,75 @@ P_DUP_LEDGER      = 0.03    # duplicate ledger rows for same ref
 # extra ghost ledger rows (ledger-only, refs that don’t exist in bank)
 N_GHOST_LEDGER = int(0.02 * N)
 
-ledger_rows = []
+r = np.random.random(N)
+r2 = np.random.random(N)
+
+# Start from a perfect match
+led_amount = amounts.copy()
+led_date = dates.copy()
 
-for i, row in bank_df.iterrows():
-    r = random.random()
-    ref = row["ref"]
+# Amount mismatch
+amt_mismatch = r2 < P_AMOUNT_MISMATCH
+delta = np.random.randint(-1500, 1501, size=N)
+delta[delta == 0] = np.random.choice([-250, 250], size=int((delta == 0).sum()))
+led_amount[amt_mismatch] += delta[amt_mismatch]
 
-    # Missing in ledger (skip)
-    if r < P_MISSING_LEDGER:
-        continue
+# Date mismatch
+date_mismatch = ~amt_mismatch & (r2 < P_AMOUNT_MISMATCH + P_DATE_MISMATCH)
+led_date[date_mismatch] += np.random.randint(-7, 8, size=int(date_mismatch.sum())).astype("timedelta64[D]")
 
-    r2 = random.random()
-    # Start from a perfect match
-    led_amount = row["amount_bank"]
-    led_date = datetime.fromisoformat(row["date_bank"])
-    category = choose_weighted(
+# (Else: matched)
+
+ledger_main = pd.DataFrame({
+    "date_ledger": led_date,
+    "ref": bank_df["ref"].to_numpy(),
+    "amount_ledger": led_amount,
+    "account_ledger": np.random.choice(ACCOUNTS, size=N),
+    "category": np.random.choice(
         ["Salary", "ATM", "Expense", "Utility Bills", "Project Income", "Charge", "Misc"],
-        [0.12, 0.08, 0.25, 0.15, 0.15, 0.15, 0.10]
-    )
+        size=N,
+        p=[0.12, 0.08, 0.25, 0.15, 0.15, 0.15, 0.10],
+    ),
     # remark text richer for ledger
-    remark = random.choice([
+    "remark": np.random.choice([
         "Cleared", "Posted", "Auto-matched", "Manual entry",
         "Vendor invoice", "Reconciled", "Pending approval"
-    ])
-
-    # Amount mismatch
-    if r2 < P_AMOUNT_MISMATCH:
-        led_amount = row["amount_bank"] + random.randint(-1500, 1500)
-        if led_amount == row["amount_bank"]:
-            led_amount += random.choice([-250, 250])
-
-    # Date mismatch
-    elif r2 < P_AMOUNT_MISMATCH + P_DATE_MISMATCH:
-        led_date = led_date + timedelta(days=random.randint(-7, 7))
-
-    # (Else: matched)
-
-    ledger_rows.append({
-        "date_ledger": led_date.date().isoformat(),
-        "ref": ref,
-        "amount_ledger": int(led_amount),
-        "account_ledger": random.choice(ACCOUNTS),
-        "category": category,
-        "remark": remark
-    })
-
-    # Duplicate ledger row (same ref) 3% chance
-    if random.random() < P_DUP_LEDGER:
-        dup_amt = led_amount + random.choice([0, 100, -100, 250, -250])
-        dup_date = led_date + timedelta(days=random.choice([0, 1, -1]))
-        ledger_rows.append({
-            "date_ledger": dup_date.date().isoformat(),
-            "ref": ref,
-            "amount_ledger": int(dup_amt),
-            "account_ledger": random.choice(ACCOUNTS),
-            "category": category,
-            "remark": "Duplicate/adjustment"
-        })
+    ], size=N),
+})
+
+# Missing in ledger (skip)
+ledger_main = ledger_main[r >= P_MISSING_LEDGER]
+
+# Duplicate ledger row (same ref) 3% chance
+ledger_dup = ledger_main[np.random.random(len(ledger_main)) < P_DUP_LEDGER].copy()
+n_dup = len(ledger_dup)
+ledger_dup["amount_ledger"] += np.random.choice([0, 100, -100, 250, -250], size=n_dup)
+ledger_dup["date_ledger"] += np.random.choice([0, 1, -1], size=n_dup).astype("timedelta64[D]")
+ledger_dup["account_ledger"] = np.random.choice(ACCOUNTS, size=n_dup)
+ledger_dup["remark"] = "Duplicate/adjustment"
 
 # Add ghost ledger rows (no bank)
-for j in range(N_GHOST_LEDGER):
-    ref = f"LGH{300000 + j}"
-    date = random_date(START, END)
-    amt = random.randint(-10000, 25000)
-    ledger_rows.append({
-        "date_ledger": date.date().isoformat(),
-        "ref": ref,
-        "amount_ledger": int(amt),
-        "account_ledger": random.choice(ACCOUNTS),
-        "category": choose_weighted(
-            ["Expense", "Utility Bills", "Project Income", "Charge", "Misc"], 
-            [0.3, 0.2, 0.15, 0.2, 0.15]
-        ),
-        "remark": random.choice(["Manual journal", "Vendor accrual", "Pending doc", "Unmapped entry"])
-    })
-
-ledger_df = pd.DataFrame(ledger_rows)
+ledger_ghost = pd.DataFrame({
+    "date_ledger": random_dates(N_GHOST_LEDGER),
+    "ref": random_refs("LGH", 300000, N_GHOST_LEDGER),
+    "amount_ledger": np.random.randint(-10000, 25001, size=N_GHOST_LEDGER),
+    "account_ledger": np.random.choice(ACCOUNTS, size=N_GHOST_LEDGER),
+    "category": np.random.choice(
+        ["Expense", "Utility Bills", "Project Income", "Charge", "Misc"],
+        size=N_GHOST_LEDGER,
+        p=[0.3, 0.2, 0.15, 0.2, 0.15],
+    ),
+    "remark": np.random.choice(
+        ["Manual journal", "Vendor accrual", "Pending doc", "Unmapped entry"], size=N_GHOST_LEDGER
+    ),
+})
+
+# Keep each duplicate right after its source row, ghosts at the end
+ledger_df = pd.concat([
+    pd.concat([ledger_main, ledger_dup]).sort_index(kind="stable"),
+    ledger_ghost,
+], ignore_index=True)
+ledger_df["date_ledger"] = ledger_df["date_ledger"].dt.strftime("%Y-%m-%d")
 
 # ---------- Transactions (for NLP classifier) ----------
 TX_REMARKS = [
@@ -186,27 +199,22 @@ TX_CAT_PROBS = np.array(
 )
 TX_CAT_PROBS = TX_CAT_PROBS / TX_CAT_PROBS.sum()
 
-tx_rows = []
-for i in range(N):
-    ref = f"TXNP{500000 + i}"
-    cat = np.random.choice(TX_CATS, p=TX_CAT_PROBS)
-    remark = random.choice(TX_REMARKS)
-    tx_rows.append({
-        "ref": ref,
-        "remark": remark,
-        "category": cat
-    })
-
-tx_df = pd.DataFrame(tx_rows)
+tx_df = pd.DataFrame({
+    "ref": random_refs("TXNP", 500000, N),
+    "remark": np.random.choice(TX_REMARKS, size=N),
+    "category": np.random.choice(TX_CATS, size=N, p=TX_CAT_PROBS),
+})
 
 # ---------- Save ----------
 bank_path = os.path.join(OUT_DIR, "bank_statement.csv")
 ledger_path = os.path.join(OUT_DIR, "ledger_entries.csv")
 tx_path = os.path.join(OUT_DIR, "transactions.csv")
 
-bank_df.to_csv(bank_path, index=False)
-ledger_df.to_csv(ledger_path, index=False)
-tx_df.to_csv(tx_path, index=False)
+# The three files are independent, so write them concurrently
+with ThreadPoolExecutor(3) as pool:
+    bank_path, ledger_path, tx_path = pool.map(
+        write_csv, [bank_df, ledger_df, tx_df], [bank_path, ledger_path, tx_path]
+    )
 
 print("\n✅ Enterprise dataset generated successfully!")
 print(f"  • {bank_path} -> {len(bank_df)} rows")
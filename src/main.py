@@ -1,4 +1,5 @@
 from recommendation_engine import RecommendationEngine
+import numpy as np
 import pandas as pd
 from anomaly import RecoAnomalyDetector, AnomalyConfig
 from transaction_classifier import TransactionClassifier
@@ -13,37 +14,48 @@ transactions_df = pd.read_csv('../data/transactions.csv')
 # ---------------------------------------------------
 # 2) MERGE BANK + LEDGER
 # ---------------------------------------------------
+# Factorize ref into one shared categorical so the join hashes integer codes
+# (sorted categories keep the outer join's sorted row order)
+all_refs = pd.concat([bank_df['ref'], ledger_df['ref']]).dropna().unique()
+ref_dtype = pd.CategoricalDtype(np.sort(all_refs))
+bank_df['ref'] = bank_df['ref'].astype(ref_dtype)
+ledger_df['ref'] = ledger_df['ref'].astype(ref_dtype)
+
 merged = bank_df.merge(
     ledger_df,
     on='ref',
     suffixes=('_bank', '_ledger'),
-    how='outer'
+    how='outer',
+    validate='many_to_many'
 )
 
+# Parse both date columns once so the comparisons below are vectorized
+for col in ('date_bank', 'date_ledger'):
+    merged[col] = pd.to_datetime(merged[col], format='%Y-%m-%d', errors='coerce', cache=True)
+
+amt_bank = merged['amount_bank'].to_numpy()
+amt_led = merged['amount_ledger'].to_numpy()
+date_bank = merged['date_bank'].to_numpy()
+date_led = merged['date_ledger'].to_numpy()
+
 # ---------------------------------------------------
 # 3) MATCH FLAG
 # ---------------------------------------------------
-merged['match'] = (
-    (merged['amount_bank'] == merged['amount_ledger']) &
-    (merged['date_bank'] == merged['date_ledger'])
-)
+merged['match'] = (amt_bank == amt_led) & (date_bank == date_led)
 
 # ---------------------------------------------------
 # 4) ROOT CAUSE TAGGING
 # ---------------------------------------------------
-def root_cause(row):
-    if pd.isnull(row['amount_ledger']):
-        return 'Missing in Ledger'
-    elif pd.isnull(row['amount_bank']):
-        return 'Missing in Bank'
-    elif row['amount_bank'] != row['amount_ledger']:
-        return 'Amount Mismatch'
-    elif row['date_bank'] != row['date_ledger']:
-        return 'Date Mismatch'
-    else:
-        return 'Matched'
-
-merged['root_cause'] = merged.apply(root_cause, axis=1)
+merged['root_cause'] = np.select(
+    [
+        pd.isnull(amt_led),
+        pd.isnull(amt_bank),
+        amt_bank != amt_led,
+        date_bank != date_led,
+    ],
+    ['Missing in Ledger', 'Missing in Bank', 'Amount Mismatch', 'Date Mismatch'],
+    default='Matched'
+)
 
 print("\nReconciliation Results:")
 print(merged)
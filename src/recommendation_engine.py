@@ -1,32 +1,49 @@
 # recommendation_engine.py
+import numpy as np
 import pandas as pd
 
+# Fixed advice per root cause; rows not listed here fall through to the anomaly / OK messages
+ROOT_CAUSE_RECOMMENDATIONS = {
+    "Missing in Bank": "Bank entry missing. Check if payment is pending or incorrectly mapped.",
+    "Missing in Ledger": "Ledger entry missing. Verify vendor invoice and post the correct ledger entry.",
+    "Amount Mismatch": "Amount mismatch detected. Verify GST/rounding/partial settlement/double posting.",
+    "Date Mismatch": "Posting date mismatch. Validate processing date vs clearing date.",
+}
+RECONCILED = "Reconciled successfully. No action required."
+
+
+def _text_column(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype="string")
+    return df[col].astype("string").fillna("").str.strip()
+
+
 def generate_recommendations(df: pd.DataFrame) -> pd.DataFrame:
-    out = df.copy()
-    recos = []
-    for _, row in out.iterrows():
-        rc = str(row.get("root_cause", "")).strip()
-        ar = str(row.get("anomaly_reason", "")).strip()
-        anom = bool(row.get("iso_is_anomaly", False))
-
-        if rc == "Missing in Bank":
-            recos.append("Bank entry missing. Check if payment is pending or incorrectly mapped.")
-            continue
-        if rc == "Missing in Ledger":
-            recos.append("Ledger entry missing. Verify vendor invoice and post the correct ledger entry.")
-            continue
-        if rc == "Amount Mismatch":
-            recos.append("Amount mismatch detected. Verify GST/rounding/partial settlement/double posting.")
-            continue
-        if rc == "Date Mismatch":
-            recos.append("Posting date mismatch. Validate processing date vs clearing date.")
-            continue
-        if anom:
-            recos.append(f"High-risk anomaly: {ar}. Investigate approvals & supporting documents.")
-            continue
-        recos.append("Reconciled successfully. No action required.")
-    out["recommendation"] = recos
-    return out
+    rc = _text_column(df, "root_cause")
+    ar = _text_column(df, "anomaly_reason")
+    if "iso_is_anomaly" in df.columns:
+        anom = df["iso_is_anomaly"].fillna(False).astype(bool).to_numpy()
+    else:
+        anom = np.zeros(len(df), dtype=bool)
+
+    # Build the anomaly message once per distinct reason, not once per row
+    reasons = ar.astype("category").cat
+    anom_msgs = reasons.rename_categories(
+        ["High-risk anomaly: " + r + ". Investigate approvals & supporting documents." for r in reasons.categories]
+    )
+
+    # First matching rule wins: known root cause, then ML anomaly, else reconciled
+    recos = np.select(
+        [rc.isin(ROOT_CAUSE_RECOMMENDATIONS).to_numpy(), anom],
+        [
+            rc.map(ROOT_CAUSE_RECOMMENDATIONS).to_numpy(dtype=object),
+            anom_msgs.to_numpy(dtype=object),
+        ],
+        default=RECONCILED,
+    )
+    # only a handful of distinct sentences: store as categorical
+    return df.assign(recommendation=pd.Categorical(recos))
+
 
 def load_recommendations(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
@@ -1,26 +1,25 @@
 # ------------------------------------------------------------
-# report_pdf.py  (FINAL STABLE VERSION - NO ERRORS)
+# report_pdf.py
 # ------------------------------------------------------------
 
 import io
-import os
-import tempfile
 import pandas as pd
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
 
 
-# Convert Plotly figure → PNG → temporary file path → ReportLab Image
-def fig_to_temp_png(fig):
+# Convert Plotly figure → in-memory PNG buffer → ReportLab Image (no temp files)
+def fig_to_png_bytes(fig):
     if fig is None:
         return None
+    return io.BytesIO(fig.to_image(format="png"))
 
-    temp = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-    fig.write_image(temp.name, format="png")
-    temp.close()
-    return temp.name
+
+# Sample stylesheet, built once per process instead of once per report
+_STYLES = getSampleStyleSheet()
 
 
 def add_heading(text, stylesheet, story):
@@ -48,7 +47,7 @@ def generate_executive_report(
 ):
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4)
-    stylesheet = getSampleStyleSheet()
+    stylesheet = _STYLES
     story = []
 
     # -----------------------------
@@ -66,9 +65,8 @@ def generate_executive_report(
     add_heading("📌 Reconciliation Summary", stylesheet, story)
 
     total = len(reco_df)
-    matched = reco_df["match"].sum()
+    matched, anomalies = reco_df[["match", "iso_is_anomaly"]].sum().tolist()
     mismatched = total - matched
-    anomalies = reco_df["iso_is_anomaly"].sum()
 
     add_key_value("Total Transactions", total, stylesheet, story)
     add_key_value("Matched", matched, stylesheet, story)
@@ -79,18 +77,16 @@ def generate_executive_report(
     # Anomaly Chart
     # -----------------------------
     if anomaly_fig is not None:
-        anomaly_path = fig_to_temp_png(anomaly_fig)
         add_heading("🚩 ML Anomaly Insights", stylesheet, story)
-        story.append(Image(anomaly_path, width=5 * inch, height=3 * inch))
+        story.append(Image(fig_to_png_bytes(anomaly_fig), width=5 * inch, height=3 * inch))
         story.append(Spacer(1, 20))
 
     # -----------------------------
     # Category Chart
     # -----------------------------
     if category_fig is not None:
-        category_path = fig_to_temp_png(category_fig)
         add_heading("🏷️ NLP Categorization Overview", stylesheet, story)
-        story.append(Image(category_path, width=5 * inch, height=3 * inch))
+        story.append(Image(fig_to_png_bytes(category_fig), width=5 * inch, height=3 * inch))
         story.append(Spacer(1, 20))
 
     # -----------------------------
@@ -99,13 +95,24 @@ def generate_executive_report(
     add_heading("🧠 Top Recommendation Samples", stylesheet, story)
 
     if "recommendation" in reco_df.columns:
-        sample = reco_df.head(10)
-        for _, row in sample.iterrows():
-            story.append(Paragraph(
-                f"<b>{row['ref']}</b> — {row['root_cause']} — {row['anomaly_reason']}<br/>{row['recommendation']}",
-                stylesheet["BodyText"]
-            ))
-            story.append(Spacer(1, 12))
+        # one Table flowable for the whole sample; only the long recommendation
+        # text is a Paragraph so it wraps inside its column
+        sample = reco_df[["ref", "root_cause", "anomaly_reason", "recommendation"]].head(10).astype(str)
+        rows = [
+            [ref, rc, reason, Paragraph(reco, stylesheet["BodyText"])]
+            for ref, rc, reason, reco in sample.itertuples(index=False)
+        ]
+        table = Table(
+            [["Ref", "Root Cause", "Anomaly", "Recommendation"]] + rows,
+            colWidths=[1 * inch, 1.2 * inch, 1.8 * inch, 3 * inch],
+        )
+        table.setStyle(TableStyle([
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ]))
+        story.append(table)
+        story.append(Spacer(1, 12))
     else:
         add_paragraph("No recommendations present.", stylesheet, story)
 
@@ -121,13 +128,4 @@ def generate_executive_report(
     pdf = buffer.getvalue()
     buffer.close()
 
-    # cleanup temp files
-    try:
-        if anomaly_fig is not None:
-            os.remove(anomaly_path)
-        if category_fig is not None:
-            os.remove(category_path)
-    except:
-        pass
-
     return pdf
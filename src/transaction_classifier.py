@@ -1,4 +1,7 @@
 # transaction_classifier.py
+import re
+
+import numpy as np
 import pandas as pd
 
 KEYWORD_MAP = [
@@ -11,26 +14,49 @@ KEYWORD_MAP = [
     ("insurance", "Insurance"),
     ("wallet|top-up|recharge", "Wallet"),
 ]
+CATEGORY_LABELS = [lab for _, lab in KEYWORD_MAP] + ["Uncategorized"]
+
+# KEYWORD_MAP with each alternation split once at import
+_KW = tuple((tuple(pat.split("|")), lab) for pat, lab in KEYWORD_MAP)
+
+# One compiled alternation per KEYWORD_MAP entry (keywords escaped: matched as plain substrings)
+KEYWORD_PATTERNS = [(re.compile("|".join(map(re.escape, kws))), lab) for kws, lab in _KW]
 
+
+# Scalar reference for _classify_narrations (one narration at a time); the tests check
+# the vectorized path against it
 def _simple_nlp_category(text: str) -> str:
     if not isinstance(text, str):
         return "Uncategorized"
     t = text.lower()
-    for pat, lab in KEYWORD_MAP:
-        if any(k in t for k in pat.split("|")):
-            return lab
-    return "Uncategorized"
+    return next((lab for kws, lab in _KW if any(k in t for k in kws)), "Uncategorized")
+
+
+def _classify_narrations(narration: pd.Series) -> pd.Categorical:
+    """
+    Keyword category per narration (case-insensitive substring match, missing -> "Uncategorized").
+    One compiled-regex pass per pattern over the unique narrations only, broadcast back
+    through the factorize codes. np.select keeps KEYWORD_MAP priority (first pattern that matches wins).
+    """
+    codes, uniques = pd.factorize(narration.astype("string").str.lower())
+    text = pd.Series(uniques, dtype="string")
+    conds = [text.str.contains(rx).to_numpy(dtype=bool) for rx, _ in KEYWORD_PATTERNS]
+    uncategorized = len(KEYWORD_PATTERNS)  # index of "Uncategorized" in CATEGORY_LABELS
+    label_codes = np.select(conds, range(len(KEYWORD_PATTERNS)), default=uncategorized)
+    # missing narrations have code -1, which picks the appended "Uncategorized"
+    label_codes = np.append(label_codes, uncategorized)[codes]
+    return pd.Categorical.from_codes(label_codes, categories=CATEGORY_LABELS)
+
 
 def classify_transactions(df: pd.DataFrame) -> pd.DataFrame:
     """
     Ensure a 'predicted_category' column exists (even if we reuse 'category').
     """
-    out = df.copy()
-    if "predicted_category" in out.columns:
-        return out
-    if "category" in out.columns and out["category"].notna().any():
-        out["predicted_category"] = out["category"]
-        return out
+    if "predicted_category" in df.columns:
+        return df
+    # assign() adds the column without deep-copying the rest of the frame
+    if "category" in df.columns and df["category"].notna().any():
+        return df.assign(predicted_category=df["category"])
     # fall back to narration-based guess
-    out["predicted_category"] = out.get("narration", "").astype(str).apply(_simple_nlp_category)
-    return out
+    narration = df["narration"] if "narration" in df.columns else pd.Series("", index=df.index)
+    return df.assign(predicted_category=_classify_narrations(narration))
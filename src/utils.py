@@ -1,11 +1,74 @@
+import numpy as np
 import pandas as pd
 import os
 
+try:  # optional: fused JIT kernel for very large reconciliations
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# pandas >= 3 always copies on write; on 2.x opt in so assign()/rename() share column data
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 from anomaly import detect_anomalies
 from transaction_classifier import classify_transactions
 from recommendation_engine import load_recommendations
 
 
+ROOT_CAUSE_DTYPE = pd.CategoricalDtype(
+    ["Matched", "Missing in Bank", "Missing in Ledger", "Amount Mismatch", "Date Mismatch"]
+)
+
+# Column dtypes for the CSVs read here, so the parser builds final dtypes directly
+# (keys absent from a given file are ignored). Amounts stay float64: the match /
+# root-cause rules compare them exactly; merge_bank_ledger downcasts afterwards.
+SCHEMA = {
+    "ref": "string",
+    "amount": "float64",
+    "amount_bank": "float64",
+    "amount_ledger": "float64",
+    "account": "category",
+    "account_bank": "category",
+    "account_ledger": "category",
+    "narration": "string",
+    "category": "category",
+    "remark": "string",
+}
+
+
+def _read_csv(source, **kwargs):
+    """
+    pd.read_csv with the SCHEMA dtypes on pyarrow's multithreaded parser, retried
+    with the C engine when pyarrow rejects the input (ArrowInvalid is a ValueError).
+    """
+    try:
+        return pd.read_csv(source, engine="pyarrow", dtype=SCHEMA, **kwargs)
+    except ValueError:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pd.read_csv(source, engine="c", dtype=SCHEMA, **kwargs)
+
+
+DATE_COLUMNS = ("date", "date_bank", "date_ledger")
+
+
+def _parse_dates(df):
+    """
+    Parse the date columns of df in place, once, skipping any that are already
+    datetime64. The explicit ISO format (with cache=True for repeated dates)
+    skips per-row format inference; other layouts fall back to pandas' inference.
+    """
+    for col in DATE_COLUMNS:
+        if col not in df.columns or pd.api.types.is_datetime64_any_dtype(df[col]):
+            continue
+        try:
+            df[col] = pd.to_datetime(df[col], format="%Y-%m-%d", cache=True)
+        except (ValueError, TypeError):
+            df[col] = pd.to_datetime(df[col], cache=True)
+    return df
+
+
 # ----------------------------------------------------------------------
 # ✅ 1. Load DEFAULT dataset (bank + ledger already merged)
 # ----------------------------------------------------------------------
@@ -19,7 +82,7 @@ def load_default_transactions():
     if not os.path.exists(default_path):
         raise FileNotFoundError(f"Default dataset NOT found at {default_path}")
 
-    df = pd.read_csv(default_path)
+    df = _read_csv(default_path, parse_dates=["date_bank", "date_ledger"])
     return df
 
 
@@ -31,8 +94,8 @@ def reconcile_uploaded_files(bank_file, ledger_file):
     Takes uploaded bank & ledger CSV and runs the FULL reconciliation pipeline.
     """
 
-    bank_df = pd.read_csv(bank_file)
-    ledger_df = pd.read_csv(ledger_file)
+    bank_df = _parse_dates(_read_csv(bank_file))
+    ledger_df = _parse_dates(_read_csv(ledger_file))
 
     return run_full_reconciliation_pipeline(bank_df, ledger_df)
 
@@ -40,6 +103,52 @@ def reconcile_uploaded_files(bank_file, ledger_file):
 # ----------------------------------------------------------------------
 # ✅ 3. Merge bank & ledger files
 # ----------------------------------------------------------------------
+# Below this many merged rows the NumPy path is already fast and JIT warm-up is not worth it
+NUMBA_MIN_ROWS = 1_000_000
+
+# days_diff is stored as int16; larger gaps (e.g. 1900-01-01 placeholders) saturate here
+# instead of wrapping, so they still count as a date mismatch
+MAX_DAYS_DIFF = np.iinfo(np.int16).max
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _reconcile_kernel(ab, al, db, dl, missing_bank, missing_ledger):
+        """
+        amount_diff, days_diff, match and root-cause codes in one parallel pass.
+        db / dl are datetime64[D] viewed as int64 (NaT -> int64 min, diff counted as 0);
+        day gaps are clipped to MAX_DAYS_DIFF.
+        """
+        n = ab.shape[0]
+        nat = np.iinfo(np.int64).min
+        out_amt = np.empty_like(ab)
+        out_day = np.empty(n, dtype=np.int16)
+        out_match = np.empty(n, dtype=np.int8)
+        out_rc = np.empty(n, dtype=np.int8)
+        for i in prange(n):
+            a = abs(ab[i] - al[i])
+            d = 0 if db[i] == nat or dl[i] == nat else min(abs(db[i] - dl[i]), MAX_DAYS_DIFF)
+            out_amt[i] = a
+            out_day[i] = d
+            one_sided = missing_bank[i] or missing_ledger[i]
+            out_match[i] = 1 if (a == 0 and d == 0 and not one_sided) else 0
+            # codes index into ROOT_CAUSE_DTYPE.categories (same order as root_cause_categorical)
+            if missing_bank[i]:
+                out_rc[i] = 1
+            elif missing_ledger[i]:
+                out_rc[i] = 2
+            elif a != 0:
+                out_rc[i] = 3
+            elif d != 0:
+                out_rc[i] = 4
+            else:
+                out_rc[i] = 0
+        return out_amt, out_day, out_match, out_rc
+
+else:
+    _reconcile_kernel = None
+
+
 def merge_bank_ledger(bank_df, ledger_df):
     """
     Performs reconciliation by merging bank and ledger data.
@@ -57,32 +166,72 @@ def merge_bank_ledger(bank_df, ledger_df):
         "account": "account_ledger"
     })
 
+    # No-op when the loaders already parsed the dates
+    _parse_dates(bank_df)
+    _parse_dates(ledger_df)
+
+    # Shared ref categories so the join hashes integer codes instead of strings
+    # (sorted, to keep the outer join's sorted row order). One factorize over both
+    # sides hashes each ref once; missing refs get code -1 (NaN).
+    codes, uniques = pd.factorize(
+        pd.concat([bank_df["ref"], ledger_df["ref"]], ignore_index=True), sort=True
+    )
+    ref_dtype = pd.CategoricalDtype(uniques)
+    n_bank = len(bank_df)
+    bank_df["ref"] = pd.Categorical.from_codes(codes[:n_bank], dtype=ref_dtype)
+    ledger_df["ref"] = pd.Categorical.from_codes(codes[n_bank:], dtype=ref_dtype)
+
     merged = pd.merge(
         bank_df,
         ledger_df,
         on="ref",
         how="outer",
-        suffixes=("_bank", "_ledger")
+        suffixes=("_bank", "_ledger"),
+        indicator=True
     )
 
+    # Missing side straight from the join (a real zero-amount entry is not "missing")
+    side = merged.pop("_merge")
+    missing_bank = side.eq("right_only").to_numpy()
+    missing_ledger = side.eq("left_only").to_numpy()
+
     # Fill missing values
     merged["amount_bank"] = merged["amount_bank"].fillna(0)
     merged["amount_ledger"] = merged["amount_ledger"].fillna(0)
 
-    # Create numeric difference columns
-    merged["amount_diff"] = (merged["amount_bank"] - merged["amount_ledger"]).abs()
-    merged["days_diff"] = (
-        pd.to_datetime(merged["date_bank"]) - pd.to_datetime(merged["date_ledger"])
-    ).dt.days.fillna(0).abs()
+    # Difference columns + match flag in one pass over the raw arrays
+    db = merged["date_bank"].to_numpy(dtype="datetime64[D]")
+    dl = merged["date_ledger"].to_numpy(dtype="datetime64[D]")
+    ab = merged["amount_bank"].to_numpy()
+    al = merged["amount_ledger"].to_numpy()
+
+    if _reconcile_kernel is not None and len(merged) >= NUMBA_MIN_ROWS:
+        amt_diff, day_diff, match, codes = _reconcile_kernel(
+            ab, al, db.view("i8"), dl.view("i8"), missing_bank, missing_ledger
+        )
+    else:
+        amt_diff = np.abs(ab - al)
+        # datetime64[D] is an int64 day count: subtract the raw ints, NaT side -> 0
+        day_diff = np.abs(db.view("i8") - dl.view("i8"))
+        day_diff[np.isnat(db) | np.isnat(dl)] = 0
+        day_diff = np.minimum(day_diff, MAX_DAYS_DIFF).astype(np.int16)  # saturate, don't wrap
+        # a one-sided row never matches, even when its only amount is 0
+        match = ((amt_diff == 0) & (day_diff == 0) & ~(missing_bank | missing_ledger)).astype(np.int8)
+        codes = None
+
+    merged["amount_diff"] = amt_diff
+    merged["days_diff"] = day_diff
+    merged["match"] = match
 
-    # Match column
-    merged["match"] = (
-        (merged["amount_diff"] == 0) &
-        (merged["days_diff"] == 0)
-    ).astype(int)
+    # Rule-based root cause (categorical: int8 codes instead of repeated strings)
+    if codes is None:
+        merged["root_cause"] = root_cause_categorical(merged, missing_bank, missing_ledger)
+    else:
+        merged["root_cause"] = pd.Categorical.from_codes(codes, dtype=ROOT_CAUSE_DTYPE)
 
-    # Rule-based root cause
-    merged["root_cause"] = merged.apply(assign_root_cause, axis=1)
+    # Downcast once the rules have run on full precision: halves the bytes every later stage reads
+    for col in ("amount_bank", "amount_ledger", "amount_diff"):
+        merged[col] = merged[col].astype(np.float32)
 
     return merged
 
@@ -90,16 +239,21 @@ def merge_bank_ledger(bank_df, ledger_df):
 # ----------------------------------------------------------------------
 # ✅ 4. Root Cause Logic
 # ----------------------------------------------------------------------
-def assign_root_cause(row):
-    if row["amount_bank"] == 0:
-        return "Missing in Bank"
-    if row["amount_ledger"] == 0:
-        return "Missing in Ledger"
-    if row["amount_diff"] != 0:
-        return "Amount Mismatch"
-    if row["days_diff"] != 0:
-        return "Date Mismatch"
-    return "Matched"
+def root_cause_categorical(merged, missing_bank, missing_ledger):
+    """
+    Vectorized rule-based root cause; the first matching rule wins.
+    missing_bank / missing_ledger are boolean masks of rows present on one side only.
+    Codes index into ROOT_CAUSE_DTYPE.categories, so no strings are built per row.
+    """
+    ad = merged["amount_diff"].to_numpy()
+    dd = merged["days_diff"].to_numpy()
+
+    codes = np.select(
+        [missing_bank, missing_ledger, ad != 0, dd != 0],
+        [1, 2, 3, 4],  # Missing in Bank, Missing in Ledger, Amount Mismatch, Date Mismatch
+        default=0,  # Matched
+    ).astype(np.int8)
+    return pd.Categorical.from_codes(codes, dtype=ROOT_CAUSE_DTYPE)
 
 
 # ----------------------------------------------------------------------